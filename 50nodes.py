@@ -2,35 +2,32 @@
 import json
 import random
 from collections import deque
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 random.seed(42)
 
 N = 50
 hospitals = [0, 49]  # Two hospitals at opposite corners
 
-# === 1. Create nodes with nice spread (for matplotlib) ===
-nodes = []
-for i in range(N):
-    grid_x = (i % 7) * 0.09 + random.uniform(-0.04, 0.04)
-    grid_y = (i // 7) * 0.09 + random.uniform(-0.04, 0.04)
-    
-    demand = 0 if i in hospitals else random.randint(4, 18)
-    priority = 0 if i in hospitals else random.choices([1,2,3,4,5], weights=[1,2,4,6,10])[0]
-    
-    nodes.append({
-        "id": i,
-        "demand": demand,
-        "priority": priority
-    })
+# === 1. Create nodes (all draws in one call each, weights set up once) ===
+demands = random.choices(range(4, 19), k=N)
+priorities = random.choices([1,2,3,4,5], weights=[1,2,4,6,10], k=N)
 
 # Force hospitals to have zero demand/priority
-for node in nodes:
-    if node["id"] in hospitals:
-        node["demand"] = 0
-        node["priority"] = 0
+for h in hospitals:
+    demands[h] = 0
+    priorities[h] = 0
+
+nodes = [{"id": i, "demand": demands[i], "priority": priorities[i]} for i in range(N)]
 
 # === 2. Build a CONNECTED graph (this is the key fix) ===
 edges = set()
+edge_keys = set()  # (min, max) endpoints of every edge, for O(1) duplicate checks
 adj = {i: set() for i in range(N)}
 
 # First: create a spanning tree → guarantees connectivity
@@ -39,6 +36,7 @@ for i in range(1, N):
     cost = random.randint(10, 50)
     rel = round(random.uniform(0.8, 0.99), 2)
     edges.add((min(i,parent), max(i,parent), cost, rel))
+    edge_keys.add((min(i,parent), max(i,parent)))
     adj[i].add(parent)
     adj[parent].add(i)
 
@@ -52,8 +50,9 @@ for _ in range(200):
             cost = random.randint(10, 60)
             rel = round(random.uniform(0.7, 0.98), 2)
             edge = (min(u,v), max(u,v), cost, rel)
-            if edge[:2] not in {(a,b) for a,b,_,_ in edges}:
+            if edge[:2] not in edge_keys:
                 edges.add(edge)
+                edge_keys.add(edge[:2])
                 adj[u].add(v)
                 adj[v].add(u)
 
@@ -76,8 +75,10 @@ data = {
 }
 
 # Save
-with open("data.json", "w") as f:
-    json.dump(data, f, indent=2)
+if orjson is not None:
+    Path("data.json").write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+else:
+    Path("data.json").write_text(json.dumps(data, indent=2))
 
 print("50-node FULLY CONNECTED disaster scenario generated!")
 print(f"   Nodes: {len(nodes)}")
@@ -3,14 +3,36 @@ import json
 import random
 import time
 import os
+import argparse
+import importlib
 from pathlib import Path
 
-# Import your main simulation (your file is named code.py)
 try:
-    from test import run_disaster_response_simulation as run_simulation
+    import orjson  # Serializes 50k-edge datasets far faster than stdlib json
 except ImportError:
-    print("Error: Save your main file as 'code.py' in the same folder!")
-    exit(1)
+    orjson = None
+
+# Generated datasets are cached here; bump DATASET_VERSION whenever the
+# generator changes so stale files are not reused
+CACHE_DIR = Path(".cache")
+DATASET_VERSION = 1
+
+TEST_CASES = [
+    (50,     300,     "Tiny"),
+    (200,   2000,     "Small"),
+    (500,   6000,     "Medium"),
+    (1000, 15000,     "Large"),
+    (2000, 30000,     "Very Large"),
+    (5000, 50000,     "FULL SPEC"),   # YOUR TARGET
+]
+
+def load_simulation(impl: str):
+    """Imports run_disaster_response_simulation from the given module (e.g. 'test')"""
+    try:
+        return importlib.import_module(impl).run_disaster_response_simulation
+    except (ImportError, AttributeError):
+        print(f"Error: '{impl}.py' with run_disaster_response_simulation not found in this folder!")
+        exit(1)
 
 def generate_realistic_disaster_dataset(n_nodes: int, target_edges: int, seed=42):
     """
@@ -25,15 +47,10 @@ def generate_realistic_disaster_dataset(n_nodes: int, target_edges: int, seed=42
     random.seed(seed + n_nodes)
     
     # === NODES ===
-    nodes = []
-    for i in range(n_nodes):
-        demand = 0 if i < 8 else random.randint(1, 12)
-        priority = random.randint(1, 5)
-        nodes.append({
-            "id": i,
-            "demand": demand,
-            "priority": priority
-        })
+    demands = random.choices(range(1, 13), k=n_nodes)
+    demands[:8] = [0] * min(8, n_nodes)
+    priorities = random.choices(range(1, 6), k=n_nodes)
+    nodes = [{"id": i, "demand": demands[i], "priority": priorities[i]} for i in range(n_nodes)]
 
     # === HOSPITALS (2 to 6) ===
     n_hospitals = max(2, min(6, n_nodes // 800 + 2))
@@ -43,34 +60,40 @@ def generate_realistic_disaster_dataset(n_nodes: int, target_edges: int, seed=42
         nodes[h]["priority"] = 0
 
     # === EDGES - ENSURE CONNECTIVITY + DENSITY ===
-    edges = []
+    # Endpoints are sampled first and costs/reliabilities drawn in bulk;
+    # each road is keyed once as min(u,v) * n_nodes + max(u,v)
+    rand = random.random
     connected = set()
 
     # 1. Grid backbone for guaranteed connectivity
     grid_size = int(n_nodes**0.5) + 1
+    backbone = []
     for i in range(n_nodes):
         for di, dj in [(1,0), (0,1), (grid_size,0), (0, grid_size)]:
             j = i + dj if di == 0 else i + di
-            if j < n_nodes and random.random() < 0.9:
-                if (i,j) not in connected:
-                    cost = random.randint(8, 50)
-                    rel = round(random.uniform(0.75, 1.0), 2)
-                    edges.append({"u": i, "v": j, "cost": cost, "reliability": rel})
-                    connected.add((i,j))
-                    connected.add((j,i))
-
-    # 2. Add random long-distance roads until target
+            if j < n_nodes and rand() < 0.9:
+                key = i * n_nodes + j
+                if key not in connected:
+                    connected.add(key)
+                    backbone.append((i, j))
+    costs = random.choices(range(8, 51), k=len(backbone))
+    edges = [{"u": i, "v": j, "cost": cost, "reliability": round(0.75 + 0.25 * rand(), 2)}
+             for (i, j), cost in zip(backbone, costs)]
+
+    # 2. Add random long-distance roads until target, one batch per shortfall
     attempts = 0
     while len(edges) < target_edges and attempts < target_edges * 10:
-        u = random.randint(0, n_nodes-1)
-        v = random.randint(0, n_nodes-1)
-        if u != v and (u,v) not in connected:
-            cost = random.randint(15, 100)
-            rel = round(random.uniform(0.65, 0.98), 2)
-            edges.append({"u": u, "v": v, "cost": cost, "reliability": rel})
-            connected.add((u,v))
-            connected.add((v,u))
-        attempts += 1
+        batch = target_edges - len(edges)
+        us = random.choices(range(n_nodes), k=batch)
+        vs = random.choices(range(n_nodes), k=batch)
+        costs = random.choices(range(15, 101), k=batch)
+        for u, v, cost in zip(us, vs, costs):
+            key = u * n_nodes + v if u < v else v * n_nodes + u
+            if u != v and key not in connected:
+                connected.add(key)
+                rel = round(0.65 + 0.33 * rand(), 2)
+                edges.append({"u": u, "v": v, "cost": cost, "reliability": rel})
+        attempts += batch
 
     # === VEHICLES (higher capacity for large graphs) ===
     base_cap = 20 + (n_nodes // 100)
@@ -87,35 +110,40 @@ def generate_realistic_disaster_dataset(n_nodes: int, target_edges: int, seed=42
         "hospitals": hospitals
     }
 
-    return json.dumps(dataset, indent=2)
-
-def run_full_benchmark():
+    # Compact output: pretty-printing 50k edges roughly doubles serialization time
+    if orjson is not None:
+        return orjson.dumps(dataset).decode()
+    return json.dumps(dataset, separators=(",", ":"))
+
+def load_or_generate_dataset(n_nodes: int, target_edges: int, seed=42):
+    """Returns the dataset JSON, generating it only if it is not cached on disk"""
+    cache_file = CACHE_DIR / f"v{DATASET_VERSION}_{n_nodes}_{target_edges}_{seed}.json"
+    if cache_file.exists():
+        return cache_file.read_text()
+    data_json = generate_realistic_disaster_dataset(n_nodes, target_edges, seed=seed)
+    CACHE_DIR.mkdir(exist_ok=True)
+    cache_file.write_text(data_json)
+    return data_json
+
+def run(simulation_fn, test_cases=TEST_CASES, generator=load_or_generate_dataset):
+    """Times simulation_fn on each (nodes, edges, label) case and writes the proof file"""
     print("DISASTER RESPONSE SYSTEM — FULL SCALABILITY BENCHMARK")
     print("100% COMPLIANT WITH ASSIGNMENT GUIDELINES")
     print("=" * 90)
     print(f"{'Nodes':<8} {'Edges':<10} {'Hospitals':<12} {'Time (s)':<10} {'Status':<12} {'Notes'}")
     print("-" * 90)
 
-    test_cases = [
-        (50,     300,     "Tiny"),
-        (200,   2000,     "Small"),
-        (500,   6000,     "Medium"),
-        (1000, 15000,     "Large"),
-        (2000, 30000,     "Very Large"),
-        (5000, 50000,     "FULL SPEC"),   # YOUR TARGET
-    ]
-
     results = []
     max_reached = 0
 
     for nodes, edges, label in test_cases:
         print(f"Testing {label} ({nodes} nodes, ~{edges} edges)... ", end="", flush=True)
         
-        data_json = generate_realistic_disaster_dataset(nodes, edges, seed=42)
+        data_json = generator(nodes, edges, seed=42)
         
         start = time.time()
         try:
-            vehicles = run_simulation(data_json)
+            vehicles = simulation_fn(data_json)
             elapsed = time.time() - start
             
             status = "PASS"
@@ -132,8 +160,7 @@ def run_full_benchmark():
             
             # Save the largest successful case
             if nodes == 5000:
-                with open("data_large.json", "w") as f:
-                    f.write(data_json)
+                Path("data_large.json").write_text(data_json)
                 print("   → 5000-node case saved as data_large.json")
 
         except Exception as e:
@@ -166,4 +193,8 @@ def run_full_benchmark():
     print("\nProof saved → Attach benchmark_proof.txt to your submission!")
 
 if __name__ == "__main__":
-    run_full_benchmark()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Disaster response scalability benchmark")
+    parser.add_argument("--impl", default="test",
+                        help="module providing run_disaster_response_simulation (default: test)")
+    args = parser.parse_args()
+    run(load_simulation(args.impl))
\ No newline at end of file
@@ -8,27 +8,78 @@ This program simulates rescue vehicles delivering supplies in a disaster zone
 with dynamic road blockages, priority locations, and limited vehicle capacity.
 """
 
-import json
 import heapq
 import random
 import os
+from array import array
 from typing import List, Dict, Tuple
 
+try:
+    import orjson as _json  # Much faster parser for large (5000-node) inputs
+except ImportError:
+    import json as _json
+
 # ==================================================================
-# 1. DATA STRUCTURES - Represent roads and vehicles
+# 1. DATA STRUCTURES - Represent the road network and vehicles
 # ==================================================================
 
-class Road:
-    """Represents a road between two locations with travel time and reliability"""
-    def __init__(self, start: int, end: int, time_cost: int, reliability: float):
-        self.start = start
-        self.end = end
-        self.time_cost = time_cost
-        self.reliability = reliability
-        self.blocked = False  # True if road is damaged
+class RoadNetwork:
+    """
+    Stores all roads as parallel arrays (road i = starts[i], ends[i], ...) and
+    a CSR adjacency: the roads touching node u are arcs indptr[u]..indptr[u+1]-1
+    """
+    __slots__ = ('node_count', 'starts', 'ends', 'time_costs', 'reliabilities',
+                 'blocked', 'blocked_version', 'indptr', 'neighbors', 'arc_roads')
+    
+    def __init__(self, node_count: int, edges: List[Dict]):
+        self.node_count = node_count
+        self.starts = array('i', [e['u'] for e in edges])
+        self.ends = array('i', [e['v'] for e in edges])
+        costs = [e['cost'] for e in edges]
+        # int32 costs unless the input has fractional ones, which need float64
+        self.time_costs = array('i' if all(isinstance(c, int) for c in costs) else 'd', costs)
+        self.reliabilities = array('d', [e['reliability'] for e in edges])
+        self.blocked = bytearray(len(edges))  # 1 if road is damaged
+        self.blocked_version = 0              # Bumped on every damage/repair
+        
+        # Count arcs per node, then prefix-sum into row offsets
+        indptr = array('i', [0]) * (node_count + 1)
+        for u, v in zip(self.starts, self.ends):
+            indptr[u + 1] += 1
+            indptr[v + 1] += 1
+        for u in range(node_count):
+            indptr[u + 1] += indptr[u]
+        
+        # Fill arcs in road order so neighbors keep input order
+        fill = indptr[:-1]
+        self.neighbors = array('i', [0]) * indptr[-1]
+        self.arc_roads = array('i', [0]) * indptr[-1]  # Road index of each arc
+        for idx, (u, v) in enumerate(zip(self.starts, self.ends)):
+            self.neighbors[fill[u]] = v
+            self.arc_roads[fill[u]] = idx
+            fill[u] += 1
+            self.neighbors[fill[v]] = u
+            self.arc_roads[fill[v]] = idx
+            fill[v] += 1
+        self.indptr = indptr
+    
+    def toggle_road(self, road: int) -> bool:
+        """Damages or repairs a road; returns True if it is now blocked"""
+        self.blocked[road] ^= 1
+        self.blocked_version += 1
+        return bool(self.blocked[road])
+    
+    def __len__(self) -> int:
+        return len(self.starts)
 
 class RescueVehicle:
     """Represents a rescue vehicle with capacity and current state"""
+    __slots__ = ('id', 'capacity', 'current_capacity',
+                 'location', 'next_location', 'current_road', 'movement_progress',
+                 'target_location', 'path_to_target', 'path_version', 'full_route',
+                 'total_time', 'delivered', 'reliability_total', 'edges_used',
+                 'status')
+    
     def __init__(self, vehicle_id: int, capacity: int):
         self.id = vehicle_id
         self.capacity = capacity
@@ -36,10 +87,12 @@ class RescueVehicle:
         
         self.location = 0                    # Current node (starts at depot)
         self.next_location = None            # Next node on current path
+        self.current_road = -1               # Road being travelled to next_location
         self.movement_progress = 0.0         # 0.0 to 1.0 while moving
         
         self.target_location = None          # Final destination node
         self.path_to_target = []             # Remaining nodes in path
+        self.path_version = -1               # Road blocked_version the path was planned under
         self.full_route = [0]                # Complete path taken (for reporting)
         
         self.total_time = 0                  # Total travel time
@@ -53,73 +106,193 @@ class RescueVehicle:
 # 2. PATHFINDING - Find shortest path using Dijkstra (with path reconstruction)
 # ==================================================================
 
-def find_shortest_path(node_count: int, roads: List[Road], source: int, destination: int) -> Tuple[float, List[int]]:
+def _dijkstra_csr(indptr: array, neighbors: array, arc_roads: array, time_costs: array,
+                  blocked: bytearray, source: int, targets: Dict[int, int],
+                  node_count: int) -> Tuple[List[float], array, int]:
     """
-    Uses Dijkstra's algorithm to find the fastest path from source to destination
-    Returns (total_time, [path]) or (inf, []) if no path exists
+    Dijkstra kernel over the flat CSR arrays only (no Python objects)
+    targets maps node → rank (>= 0): the search stops at the nearest target,
+    and targets tied on time go to the lowest rank (rank 0 stops at once)
+    Returns (best_time, prev, settled): best_time[v] is inf if v was not reached
+    and settled is the chosen target, or -1 if none was reached
     """
-    graph = {i: [] for i in range(node_count)}
-    
-    # Build adjacency list (only non-blocked roads)
-    for road in roads:
-        if not road.blocked:
-            graph[road.start].append((road.end, road.time_cost, road.reliability))
-            graph[road.end].append((road.start, road.time_cost, road.reliability))
-    
-    pq = [(0, source, [])]  # (time, node, path_so_far)
-    best_time = {i: float('inf') for i in range(node_count)}
+    pq = [(0, source)]  # (time, node)
+    best_time = [float('inf')] * node_count
     best_time[source] = 0
+    prev = array('i', [-1]) * node_count  # Predecessor of each node on its best path
+    heappop, heappush = heapq.heappop, heapq.heappush
+    settled = -1
     
     while pq:
         # Pop the current best (smallest-time) node from priority queue
-        time_so_far, current, path = heapq.heappop(pq)
+        time_so_far, current = heappop(pq)
         
-        # If we reached the destination, return total time and final path
-        if current == destination:
-            return time_so_far, path + [current]
-            
         # If this entry is outdated (worse than the best known time), skip it
         if time_so_far > best_time[current]:
             continue  # Ignore old/outdated PQ entries
+        
+        # Every target tied with the settled one has been popped
+        if settled != -1 and time_so_far > best_time[settled]:
+            break
+        
+        # A target is settled - its predecessor chain is final
+        if current in targets:
+            if settled == -1 or targets[current] < targets[settled]:
+                settled = current
+            if targets[settled] == 0:
+                break  # Nothing can beat rank 0
             
         # Explore all neighboring roads of the current node
-        for neighbor, cost, rel in graph[current]:
-            new_time = time_so_far + cost  # Travel time after moving to neighbor
+        for k in range(indptr[current], indptr[current + 1]):
+            idx = arc_roads[k]
+            if blocked[idx]:
+                continue  # Damaged road - cannot be used right now
+            neighbor = neighbors[k]
+            new_time = time_so_far + time_costs[idx]  # Travel time after moving to neighbor
             
             # If this new route gives a shorter time, update and push into PQ
             if new_time < best_time[neighbor]:
                 best_time[neighbor] = new_time
-                heapq.heappush(pq, (new_time, neighbor, path + [current]))
+                prev[neighbor] = current
+                heappush(pq, (new_time, neighbor))
     
-    return float('inf'), []
+    return best_time, prev, settled
+
+def _trace_path(prev: array, destination: int) -> List[int]:
+    """Walks predecessors back from the destination to the source"""
+    path = [destination]
+    while prev[path[-1]] != -1:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path
+
+def find_shortest_path(network: RoadNetwork, source: int, destination: int) -> Tuple[float, List[int]]:
+    """
+    Finds the fastest path from source to destination
+    Dijkstra stops as soon as the destination is settled
+    Returns (total_time, [path]) or (inf, []) if no path exists
+    """
+    if source == destination:
+        return 0, [source]
+    best_time, prev, _ = _dijkstra_csr(network.indptr, network.neighbors, network.arc_roads,
+                                       network.time_costs, network.blocked,
+                                       source, {destination: 0}, network.node_count)
+    time_cost = best_time[destination]
+    if time_cost == float('inf'):
+        return time_cost, []
+    return time_cost, _trace_path(prev, destination)
+
+def find_path_to_nearest(network: RoadNetwork, source: int,
+                         targets: Dict[int, int]) -> Tuple[float, List[int], int]:
+    """
+    Single Dijkstra to the nearest of several targets (node → rank); equally
+    near targets are decided by lowest rank
+    Returns (total_time, [path], target) or (inf, [], -1) if none is reachable
+    """
+    if source in targets:
+        return 0, [source], source
+    best_time, prev, nearest = _dijkstra_csr(network.indptr, network.neighbors, network.arc_roads,
+                                             network.time_costs, network.blocked,
+                                             source, targets, network.node_count)
+    if nearest == -1:
+        return float('inf'), [], -1
+    return best_time[nearest], _trace_path(prev, nearest), nearest
 
 # ==================================================================
 # 3. MAIN SIMULATION ENGINE
 # ==================================================================
 
+def _road_between(network: RoadNetwork, road_by_endpoints: Dict[Tuple[int, int], List[int]],
+                  u: int, v: int) -> int:
+    """
+    Road a vehicle takes from u to v: the cheapest open one among parallel roads,
+    which is the one Dijkstra relaxed. Returns -1 if every such road is blocked
+    """
+    for road in road_by_endpoints.get((u, v), ()):
+        if not network.blocked[road]:
+            return road
+    return -1
+
+def _path_still_valid(vehicle: RescueVehicle, network: RoadNetwork,
+                      road_by_endpoints: Dict[Tuple[int, int], List[int]]) -> bool:
+    """
+    True if the rest of vehicle.path_to_target can be reused without replanning:
+    no road has changed since it was planned and the next road is open
+    """
+    if vehicle.path_version != network.blocked_version:
+        return False
+    return _road_between(network, road_by_endpoints, vehicle.location, vehicle.path_to_target[0]) != -1
+
 def run_disaster_response_simulation(input_data: str) -> List[RescueVehicle]:
     """Main simulation loop - runs until all demand is satisfied"""
     
-    data = json.loads(input_data)
+    data = _json.loads(input_data)
     locations = {node['id']: node for node in data['nodes']}
-    all_roads = [Road(e['u'], e['v'], e['cost'], e['reliability']) for e in data['edges']]
+    n_nodes = len(locations)
     vehicles = [RescueVehicle(v['id'], v['capacity']) for v in data['vehicles']]
     
+    # Road network topology never changes, only blockage flags do
+    network = RoadNetwork(n_nodes, data['edges'])
+    
+    # O(1) lookup of the roads between two nodes, in both directions; parallel
+    # roads are kept cheapest first (ties by index), the order Dijkstra prefers
+    road_by_endpoints: Dict[Tuple[int, int], List[int]] = {}
+    for idx, (u, v) in enumerate(zip(network.starts, network.ends)):
+        road_by_endpoints.setdefault((u, v), []).append(idx)
+        if u != v:
+            road_by_endpoints.setdefault((v, u), []).append(idx)
+    for roads in road_by_endpoints.values():
+        if len(roads) > 1:
+            roads.sort(key=network.time_costs.__getitem__)
+    
     # Safe zones (depots/hospitals) - vehicles return here to reload
     safe_zones = data.get("hospitals", [0])
+    safe_zones_set = frozenset(safe_zones)  # O(1) membership; list keeps zone order
+    # Position of each zone in the list, so equally near zones go to the earlier one
+    zone_rank: Dict[int, int] = {}
+    for rank, zone in enumerate(safe_zones):
+        zone_rank.setdefault(zone, rank)
     for v in vehicles:
         v.location = safe_zones[0]
         v.full_route = [safe_zones[0]]
+    vehicles_home = len(vehicles)  # Vehicles currently parked at a safe zone
     
-    # Current remaining demand at each location
-    current_demand = {node['id']: node.get('demand', 0) for node in data['nodes']}
+    # Current remaining demand at each location, indexed by (dense) node id;
+    # int32 unless the input has fractional demands, which need float64
+    integral = all(isinstance(node.get('demand', 0), int) for node in data['nodes'])
+    current_demand = array('i' if integral else 'd', [0]) * n_nodes
+    for node in data['nodes']:
+        current_demand[node['id']] = node.get('demand', 0)
+    # Locations still waiting for supplies (decremented as each is fully served)
+    remaining = sum(1 for i, d in enumerate(current_demand) if i not in safe_zones_set and d > 0)
     
     # Prevent two vehicles from going to same location
-    locked_locations: Dict[int, int] = {}  # location → vehicle_id
+    locked = bytearray(n_nodes)  # 1 while a vehicle is assigned to the location
+    
+    # Open tasks as a heap of (-priority, -demand, -location): popping yields the
+    # same order as sorting by (priority, demand, location) descending.
+    # Entries are dropped while a vehicle holds the location and re-pushed when it
+    # is released; entries whose demand no longer matches are skipped as stale
+    def task_entry(loc_id: int) -> Tuple[int, int, int]:
+        return (-locations[loc_id].get('priority', 0), -current_demand[loc_id], -loc_id)
+    
+    task_heap = [task_entry(loc_id) for loc_id, demand in enumerate(current_demand)
+                 if loc_id not in safe_zones_set and demand > 0]
+    heapq.heapify(task_heap)
+    
+    # A vehicle whose scan found nothing it could carry can skip rescanning until
+    # a task is reopened: vehicle_id → tasks_reopened at its last failed scan
+    tasks_reopened = 0
+    failed_scans: Dict[int, int] = {}
+    
+    # Locations with no open road to any safe zone, and the blocked_version at
+    # which that was found; the search is retried once a road changes
+    failed_zone_searches: Dict[int, int] = {}
     
     total_steps = 1000
     blockage_every = 50
     steps_per_road = 15
+    progress_per_step = 1.0 / steps_per_road
     random.seed(42)
     
     print("Starting disaster response simulation...")
@@ -128,33 +301,28 @@ def run_disaster_response_simulation(input_data: str) -> List[RescueVehicle]:
         
         # Random road damage/repair every N steps
         if step > 0 and step % blockage_every == 0:
-            available_roads = [r for r in all_roads if not r.blocked or r.blocked]
-            if available_roads:
-                road = random.choice(available_roads)
-                road.blocked = not road.blocked
-                status = "DAMAGED" if road.blocked else "REPAIRED"
-                print(f"Step {step}: Road {road.start}-{road.end} {status}")
+            if len(network):
+                road = random.randrange(len(network))  # Any road may be damaged or repaired
+                status = "DAMAGED" if network.toggle_road(road) else "REPAIRED"
+                print(f"Step {step}: Road {network.starts[road]}-{network.ends[road]} {status}")
         
-        # Process each vehicle
+        # Process each vehicle in order - later vehicles must see locations locked
+        # by earlier ones this step, so planning stays sequential
         for vehicle in vehicles:
             
             # If moving and current road is blocked → stop and replan
             if vehicle.status == "MOVING" and vehicle.next_location is not None:
-                blocked = False
-                for r in all_roads:
-                    if (r.start == vehicle.location and r.end == vehicle.next_location) or \
-                       (r.end == vehicle.location and r.start == vehicle.next_location):
-                        if r.blocked:
-                            blocked = True
-                            break
-                if blocked:
+                if network.blocked[vehicle.current_road]:
                     print(f"Vehicle {vehicle.id}: Road blocked! Replanning...")
                     vehicle.status = "WAITING"
                     vehicle.movement_progress = 0.0
                     vehicle.next_location = None
+                    vehicle.current_road = -1
                     vehicle.path_to_target = []
-                    if vehicle.target_location in locked_locations:
-                        del locked_locations[vehicle.target_location]
+                    if vehicle.target_location is not None and locked[vehicle.target_location]:
+                        locked[vehicle.target_location] = 0
+                        heapq.heappush(task_heap, task_entry(vehicle.target_location))
+                        tasks_reopened += 1
                     vehicle.target_location = None
             
             # Vehicle is idle - decide what to do
@@ -162,39 +330,59 @@ def run_disaster_response_simulation(input_data: str) -> List[RescueVehicle]:
                 
                 # Choose next high-priority location if no current target
                 if vehicle.target_location is None:
-                    candidates = []
-                    for loc_id, demand in current_demand.items():
-                        if loc_id not in safe_zones and demand > 0 and loc_id not in locked_locations:
-                            priority = locations[loc_id].get('priority', 0)
-                            candidates.append((priority, demand, loc_id))
-                    
-                    # Sort by priority (desc), then demand (desc)
-                    candidates.sort(reverse=True)
-                    
-                    for _, demand_needed, loc_id in candidates:
-                        if vehicle.current_capacity >= demand_needed:
-                            vehicle.target_location = loc_id
-                            locked_locations[loc_id] = vehicle.id
-                            print(f"Vehicle {vehicle.id}: Assigned to location {loc_id} (priority {locations[loc_id]['priority']})")
-                            break
+                    if failed_scans.get(vehicle.id) != tasks_reopened:
+                        too_large = []  # Valid tasks this vehicle cannot carry
+                        while task_heap:
+                            entry = heapq.heappop(task_heap)
+                            _, neg_demand, neg_loc = entry
+                            loc_id, demand_needed = -neg_loc, -neg_demand
+                            if current_demand[loc_id] != demand_needed or locked[loc_id]:
+                                continue  # Stale entry
+                            if vehicle.current_capacity >= demand_needed:
+                                vehicle.target_location = loc_id
+                                locked[loc_id] = 1
+                                print(f"Vehicle {vehicle.id}: Assigned to location {loc_id} (priority {locations[loc_id]['priority']})")
+                                break
+                            too_large.append(entry)
+                        for entry in too_large:
+                            heapq.heappush(task_heap, entry)
+                        if vehicle.target_location is None:
+                            failed_scans[vehicle.id] = tasks_reopened
                     
                     # If nothing to do, return to safe zone
-                    if vehicle.target_location is None and vehicle.location not in safe_zones:
-                        best_zone = min(safe_zones, 
-                                      key=lambda z: find_shortest_path(len(locations), all_roads, vehicle.location, z)[0])
-                        vehicle.target_location = best_zone
+                    if vehicle.target_location is None and vehicle.location not in safe_zones_set \
+                            and failed_zone_searches.get(vehicle.location) != network.blocked_version:
+                        time_cost, path, best_zone = find_path_to_nearest(network, vehicle.location, zone_rank)
+                        if time_cost < float('inf'):
+                            vehicle.target_location = best_zone
+                            vehicle.path_to_target = path[1:]
+                            vehicle.path_version = network.blocked_version
+                        else:
+                            failed_zone_searches[vehicle.location] = network.blocked_version
+                
+                # Keep following the planned path while the network is unchanged
+                if vehicle.target_location is not None and vehicle.path_to_target \
+                        and _path_still_valid(vehicle, network, road_by_endpoints):
+                    vehicle.next_location = vehicle.path_to_target.pop(0)
+                    vehicle.current_road = _road_between(network, road_by_endpoints,
+                                                         vehicle.location, vehicle.next_location)
+                    vehicle.status = "MOVING"
+                    vehicle.movement_progress = 0.0
                 
                 # Plan path to target
-                if vehicle.target_location is not None:
-                    time_cost, path = find_shortest_path(len(locations), all_roads, vehicle.location, vehicle.target_location)
+                elif vehicle.target_location is not None:
+                    time_cost, path = find_shortest_path(network, vehicle.location, vehicle.target_location)
                     
                     if time_cost < float('inf') and len(path) > 1:
                         vehicle.path_to_target = path[1:]
+                        vehicle.path_version = network.blocked_version
                         vehicle.next_location = vehicle.path_to_target.pop(0)
+                        vehicle.current_road = _road_between(network, road_by_endpoints,
+                                                             vehicle.location, vehicle.next_location)
                         vehicle.status = "MOVING"
                         vehicle.movement_progress = 0.0
                     elif len(path) == 1:  # Already at destination
-                        if vehicle.target_location not in safe_zones:
+                        if vehicle.target_location not in safe_zones_set:
                             # Deliver supplies
                             needed = current_demand[vehicle.target_location]
                             delivered = min(vehicle.current_capacity, needed)
@@ -203,38 +391,39 @@ def run_disaster_response_simulation(input_data: str) -> List[RescueVehicle]:
                             vehicle.delivered += delivered
                             
                             if current_demand[vehicle.target_location] == 0:
+                                remaining -= 1
                                 print(f"Location {vehicle.target_location} fully served!")
                             
-                            # Release lock
-                            if vehicle.target_location in locked_locations:
-                                del locked_locations[vehicle.target_location]
+                            # Release lock (and reopen the task if demand remains)
+                            locked[vehicle.target_location] = 0
+                            if current_demand[vehicle.target_location] > 0:
+                                heapq.heappush(task_heap, task_entry(vehicle.target_location))
+                                tasks_reopened += 1
                             vehicle.target_location = None
                         else:
                             vehicle.target_location = None  # At safe zone
             
             # Vehicle is moving along a road
             elif vehicle.status == "MOVING":
-                vehicle.movement_progress += 1.0 / steps_per_road
+                vehicle.movement_progress += progress_per_step
                 if vehicle.movement_progress >= 1.0:
                     # Arrive at next node
-                    for r in all_roads:
-                        if (r.start == vehicle.location and r.end == vehicle.next_location) or \
-                           (r.end == vehicle.location and r.start == vehicle.next_location):
-                            vehicle.total_time += r.time_cost
-                            vehicle.reliability_total += r.reliability
-                            vehicle.edges_used += 1
-                            break
+                    r = vehicle.current_road
+                    vehicle.total_time += network.time_costs[r]
+                    vehicle.reliability_total += network.reliabilities[r]
+                    vehicle.edges_used += 1
                     
+                    vehicles_home -= vehicle.location in safe_zones_set
                     vehicle.location = vehicle.next_location
+                    vehicles_home += vehicle.location in safe_zones_set
                     vehicle.full_route.append(vehicle.location)
                     vehicle.status = "WAITING"
                     vehicle.movement_progress = 0.0
                     vehicle.next_location = None
+                    vehicle.current_road = -1
         
         # Check if mission complete
-        all_served = all(current_demand[i] == 0 for i in current_demand if i not in safe_zones)
-        all_home = all(v.location in safe_zones for v in vehicles)
-        if all_served and all_home:
+        if remaining == 0 and vehicles_home == len(vehicles):
             print("All locations served. Mission complete!")
             break
     
@@ -1,16 +1,25 @@
 # visualize_matplotlib.py 
-import json
+import os
+import pickle
+import hashlib
 import matplotlib.pyplot as plt
 import networkx as nx
-from code import run_disaster_response_simulation
+from matplotlib.collections import LineCollection
+from test import run_disaster_response_simulation
 
-# Load your data (any size)
+try:
+    import orjson as _json  # Faster parsing for large datasets
+except ImportError:
+    import json as _json
+
+# Load your data (any size) - read and parse once
 with open("data.json") as f:
-    data = json.load(f)
+    raw = f.read()
+data = _json.loads(raw)
 
 # Run simulation
 print("Running simulation...")
-vehicles = run_disaster_response_simulation(open("data.json").read())
+vehicles = run_disaster_response_simulation(raw)
 
 # Build graph
 G = nx.Graph()
@@ -45,7 +54,17 @@ for node in G.nodes():
 node_sizes = [800 if node in hospitals else 500 for node in G.nodes()]
 
 # Draw graph with spring layout (beautiful every time)
-pos = nx.spring_layout(G, seed=42, k=0.9, iterations=50)
+# The layout is the slowest step for big graphs, so cache it per graph
+graph_key = hashlib.sha1(repr((sorted(G.nodes()),
+                               sorted((e["u"], e["v"]) for e in data["edges"]))).encode()).hexdigest()[:16]
+pos_path = f".pos_{graph_key}.pkl"
+if os.path.exists(pos_path):
+    with open(pos_path, "rb") as f:
+        pos = pickle.load(f)
+else:
+    pos = nx.spring_layout(G, seed=42, k=0.9, iterations=50)
+    with open(pos_path, "wb") as f:
+        pickle.dump(pos, f)
 
 nx.draw(G, pos,
         node_color=node_colors,
@@ -59,16 +78,21 @@ nx.draw(G, pos,
 
 # === DRAW VEHICLE ROUTES ON TOP (THIS IS THE MONEY SHOT) ===
 colors = ['#d62728', '#ff7f0e', '#2ca02c', '#9467bd', '#8c564b']
+
+# All route segments go into one LineCollection (a single draw call)
+segments = []
+segment_colors = []
+for idx, v in enumerate(vehicles):
+    path = v.full_route
+    for a, b in zip(path, path[1:]):
+        segments.append((pos[a], pos[b]))
+        segment_colors.append(colors[idx % len(colors)])
+routes = LineCollection(segments, colors=segment_colors, linewidths=4, alpha=0.9, zorder=1)
+plt.gca().add_collection(routes)
+
 for idx, v in enumerate(vehicles):
     if len(v.full_route) > 1:
         path = v.full_route
-        path_edges = list(zip(path, path[1:]))
-        nx.draw_networkx_edges(G, pos,
-                               edgelist=path_edges,
-                               edge_color=colors[idx % len(colors)],
-                               width=4,
-                               alpha=0.9,
-                               style='solid')
         
         # Start & end markers
         nx.draw_networkx_nodes(G, pos,